@@ -1,9 +1,9 @@
-use clap::error::Result;
 use log::info;
 use serde::Serialize;
 use std::{
     error::Error,
     fs::{self, File},
+    io::{BufWriter, Write},
     path::PathBuf,
 };
 
@@ -37,7 +37,9 @@ impl Output {
         let mut file_output_path = output_path;
         file_output_path.push(format!("diversity-{}{}", routing_metric, ".json"));
         let file = File::create(file_output_path.clone()).expect("Error creating file.");
-        serde_json::to_writer_pretty(file, self).expect("Error writing to JSON file.");
+        let mut writer = BufWriter::new(file);
+        serde_json::to_writer_pretty(&mut writer, self).expect("Error writing to JSON file.");
+        writer.flush()?;
         info!(
             "Diversity output written to {}.",
             file_output_path.display()
@@ -7,8 +7,8 @@ use std::sync::{Arc, Mutex};
 
 mod io;
 mod total_diversity;
-use io::*;
-use total_diversity::*;
+use io::Output;
+use total_diversity::total_graph_diversity;
 
 #[derive(clap::Parser)]
 #[command(name = "graph-diversity", version, about)]
@@ -7,7 +7,7 @@ use simlib::{
     graph::Graph, traversal::pathfinding::PathFinder, CandidatePath, Path, RoutingMetric, ID,
 };
 use std::collections::HashMap;
-use std::sync::{Arc, Mutex};
+use std::sync::atomic::{AtomicUsize, Ordering};
 #[cfg(test)]
 use std::{println as info, println as debug};
 
@@ -29,30 +29,29 @@ pub(crate) fn total_graph_diversity(
     let pairs: Vec<(String, String)> = ids.into_iter().tuple_combinations().collect();
     let count = pairs.len() as f32;
     info!("Computing graph diversity using {} pairs.", count);
-    let outstanding = Arc::new(Mutex::new(pairs.len()));
-    let div_scores = Arc::new(Mutex::new(Vec::new()));
-    pairs.par_iter().for_each(|comb| {
-        info!("{} computations to go.", outstanding.lock().unwrap());
-        let (src, dest) = (comb.0.clone(), comb.1.clone());
-        let diversities =
-            effective_path_diversity(&src, &dest, graph, k, routing_metric, lambdas, amount);
-        div_scores.lock().unwrap().push(diversities);
-        *outstanding.lock().unwrap() -= 1;
-    });
-    let mut scores: HashMap<(usize, usize), f32> = HashMap::new();
-    if let Ok(arc) = Arc::try_unwrap(div_scores) {
-        if let Ok(mutex) = arc.into_inner() {
-            for d in mutex {
-                for (k, v) in d {
-                    if let Some(x) = scores.get_mut(&k) {
-                        *x += v;
-                    } else {
-                        scores.insert(k, v);
-                    }
-                }
+    let outstanding = AtomicUsize::new(pairs.len());
+    let scores: HashMap<(usize, usize), f32> = pairs
+        .par_iter()
+        .fold(HashMap::new, |mut scores, comb| {
+            info!(
+                "{} computations to go.",
+                outstanding.load(Ordering::Relaxed)
+            );
+            let (src, dest) = comb;
+            let diversities =
+                effective_path_diversity(src, dest, graph, k, routing_metric, lambdas, amount);
+            for (key, v) in diversities {
+                *scores.entry(key).or_insert(0.0) += v;
             }
-        }
-    }
+            outstanding.fetch_sub(1, Ordering::Relaxed);
+            scores
+        })
+        .reduce(HashMap::new, |mut scores, other| {
+            for (key, v) in other {
+                *scores.entry(key).or_insert(0.0) += v;
+            }
+            scores
+        });
     for (k, v) in scores {
         let diversity = v / count;
         let gd = GraphDiversity {
@@ -85,89 +85,80 @@ impl Graph {
         Self::from_json_str(&json_str, graph_source)
     }
 
-    fn nodes_from_raw_lnd_graph(nodes: &[RawLndNode]) -> HashSet<Node> {
+    fn nodes_from_raw_lnd_graph(nodes: Vec<RawLndNode>) -> HashSet<Node> {
         // discard nodes without ID
         nodes
-            .iter()
-            .filter(|raw_node| raw_node.id.clone().unwrap_or_default() != ID::default())
-            .map(|raw_node| Node::from_raw_lnd(raw_node.clone()))
+            .into_iter()
+            .filter(|raw_node| !raw_node.id.as_deref().unwrap_or_default().is_empty())
+            .map(Node::from_raw_lnd)
             .collect()
     }
 
-    fn nodes_from_raw_lnresearch_graph(nodes: &[RawLnresearchNode]) -> HashSet<Node> {
+    fn nodes_from_raw_lnresearch_graph(nodes: Vec<RawLnresearchNode>) -> HashSet<Node> {
         // discard nodes without ID
         nodes
-            .iter()
-            .filter(|raw_node| raw_node.id.clone().unwrap_or_default() != ID::default())
-            .map(|raw_node| Node::from_raw_lnresearch(raw_node.clone()))
+            .into_iter()
+            .filter(|raw_node| !raw_node.id.as_deref().unwrap_or_default().is_empty())
+            .map(Node::from_raw_lnresearch)
             .collect()
     }
 
     pub fn from_lnresearch_json_str(json_str: &str) -> Result<Graph, serde_json::Error> {
         let raw_graph: RawLnresearchGraph =
             serde_json::from_str(json_str).expect("Error deserialising JSON str!");
-        let nodes = Self::nodes_from_raw_lnresearch_graph(&raw_graph.nodes);
-        let mut edges: HashMap<ID, HashSet<Edge>> = HashMap::with_capacity(raw_graph.edges.len());
+        let nodes = Self::nodes_from_raw_lnresearch_graph(raw_graph.nodes);
+        let num_edges = raw_graph.edges.len();
         // discard edges with unknown IDs
-        let edges_vec: Vec<HashSet<Edge>> = raw_graph
+        let edges_iter = raw_graph
             .edges
             .iter()
-            .map(|adj| {
-                adj.iter()
-                    .filter(|raw_edge| {
-                        // We only need the ID to know if the node exists
-                        let src_node = Node {
-                            id: raw_edge.source.clone().unwrap(),
-                            ..Default::default()
-                        };
-                        let dest_node = Node {
-                            id: raw_edge.destination.clone().unwrap(),
-                            ..Default::default()
-                        };
-                        nodes.contains(&src_node) && nodes.contains(&dest_node)
-                    })
-                    .filter(|raw_edge| Edge::from_lnresearch_raw(&(*raw_edge).clone()).is_some())
-                    .map(|raw_edge| Edge::from_lnresearch_raw(raw_edge).unwrap())
-                    .collect()
+            .flatten()
+            .filter(|raw_edge| {
+                Self::nodes_are_known(&nodes, &raw_edge.source, &raw_edge.destination)
             })
-            .collect();
-        for node_adj in edges_vec {
-            for edge in node_adj {
-                match edges.get_mut(&edge.source) {
-                    Some(node) => node.insert(edge),
-                    None => {
-                        edges.insert(edge.source.clone(), HashSet::from([edge]));
-                        true // weird so that match arms return same type
-                    }
-                };
-            }
-        }
+            .filter_map(Edge::from_lnresearch_raw);
+        let edges = Self::group_edges_by_source(edges_iter, num_edges);
         Ok(Graph { nodes, edges })
     }
     pub fn from_lnd_json_str(json_str: &str) -> Result<Graph, serde_json::Error> {
         let raw_graph: RawLndGraph =
             serde_json::from_str(json_str).expect("Error deserialising JSON str!");
-        let nodes = Self::nodes_from_raw_lnd_graph(&raw_graph.nodes);
-        let mut edges: HashMap<ID, HashSet<Edge>> = HashMap::with_capacity(raw_graph.edges.len());
+        let nodes = Self::nodes_from_raw_lnd_graph(raw_graph.nodes);
+        let num_edges = raw_graph.edges.len();
         // discard edges with unknown IDs
-        let mut edges_vec = vec![];
-        for raw_edge in raw_graph.edges {
-            let src_node = Node {
-                id: raw_edge.source.clone().unwrap(),
-                ..Default::default()
-            };
-            let dest_node = Node {
-                id: raw_edge.destination.clone().unwrap(),
-                ..Default::default()
-            };
-            if nodes.contains(&src_node) && nodes.contains(&dest_node) {
-                if let Some(edge) = Edge::from_lnd_raw(&(raw_edge).clone()) {
-                    edges_vec.push(edge.0);
-                    edges_vec.push(edge.1);
-                }
-            }
-        }
-        for edge in edges_vec {
+        let edges_iter = raw_graph
+            .edges
+            .iter()
+            .filter(|raw_edge| {
+                Self::nodes_are_known(&nodes, &raw_edge.source, &raw_edge.destination)
+            })
+            .filter_map(Edge::from_lnd_raw)
+            .flat_map(|edge| [edge.0, edge.1]);
+        let edges = Self::group_edges_by_source(edges_iter, num_edges);
+        Ok(Graph { nodes, edges })
+    }
+
+    /// True if both the edge's source and destination are in the set of nodes
+    fn nodes_are_known(nodes: &HashSet<Node>, source: &Option<ID>, dest: &Option<ID>) -> bool {
+        // We only need the ID to know if the node exists
+        let src_node = Node {
+            id: source.clone().unwrap(),
+            ..Default::default()
+        };
+        let dest_node = Node {
+            id: dest.clone().unwrap(),
+            ..Default::default()
+        };
+        nodes.contains(&src_node) && nodes.contains(&dest_node)
+    }
+
+    /// Builds the adjacency map of each node's outgoing edges
+    fn group_edges_by_source(
+        edges_iter: impl Iterator<Item = Edge>,
+        capacity: usize,
+    ) -> HashMap<ID, HashSet<Edge>> {
+        let mut edges: HashMap<ID, HashSet<Edge>> = HashMap::with_capacity(capacity);
+        for edge in edges_iter {
             match edges.get_mut(&edge.source) {
                 Some(node) => node.insert(edge),
                 None => {
@@ -176,7 +167,7 @@ impl Graph {
                 }
             };
         }
-        Ok(Graph { nodes, edges })
+        edges
     }
     pub fn get_nodes(self) -> HashSet<Node> {
         self.nodes
@@ -194,13 +185,13 @@ impl Graph {
             .collect()
     }
     pub fn get_edges_for_node(&self, node_id: &ID) -> HashSet<Edge> {
-        match self.get_edges().get(node_id) {
+        match self.edges.get(node_id) {
             Some(adj_list) => adj_list.to_owned(),
             None => HashSet::default(),
         }
     }
     pub fn edge_count(self) -> usize {
-        self.get_edges_as_vec_vec().iter().map(Vec::len).sum()
+        self.edges.values().map(HashSet::len).sum()
     }
 
     #[allow(unused)]
@@ -216,6 +207,7 @@ pub fn read_node_rankings_from_file(
     let file = File::open(path).unwrap_or_else(|_| panic!("Error reading {}.", path.display()));
     let reader = BufReader::new(file);
     let mut ranks: NodeRanks = vec![];
+    let nodes: HashSet<&ID> = nodes.iter().collect();
     for line in reader.lines().map_while(Result::ok) {
         if nodes.contains(&line) {
             ranks.push(line);
@@ -8,13 +8,24 @@ use simlib::{
 
 use rayon::prelude::*;
 use std::path::PathBuf;
-use std::sync::{Arc, Mutex};
 use std::{error::Error, time::Instant};
 
 use clap::Parser;
 use env_logger::Env;
 use log::{error, info};
 
+/// Payment amounts (in sat) simulated for each scenario
+static AMOUNTS: [usize; 11] = [
+    100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000, 5000000, 10000000,
+];
+/// Scenarios simulated in each batch
+static WEIGHT_PARTS: [WeightPartsCombi; 4] = [
+    WeightPartsCombi::MinFeeSingle,
+    WeightPartsCombi::MaxProbSingle,
+    WeightPartsCombi::MinFeeMulti,
+    WeightPartsCombi::MaxProbMulti,
+];
+
 #[derive(clap::Parser)]
 #[command(name = "batch-simulator", version, about)]
 struct Cli {
@@ -95,42 +106,33 @@ fn main() {
         adversary_selection.push(AdversarySelection::Random);
     };
 
-    let amounts = vec![
-        100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000, 5000000, 10000000,
-    ];
-    let weight_parts = vec![
-        WeightPartsCombi::MinFeeSingle,
-        WeightPartsCombi::MaxProbSingle,
-        WeightPartsCombi::MinFeeMulti,
-        WeightPartsCombi::MaxProbMulti,
-    ];
     let pairs = Simulation::draw_n_pairs_for_simulation(&graph, number_of_sim_pairs);
-    let mut results = Vec::with_capacity(4);
-    for combi in weight_parts {
-        let sim_results = Arc::new(Mutex::new(Vec::with_capacity(amounts.len())));
-        amounts.par_iter().for_each(|amount| {
-            let start = Instant::now();
-            let msat = simlib::to_millisatoshi(*amount);
-            let sim = init_sim(seed, graph.clone(), msat, combi, &adversary_selection);
-            info!(
-                "Starting {:?} simulation of {} pairs of {} sats.",
-                combi, number_of_sim_pairs, amount,
-            );
-            let sim_result = simulate(sim, pairs.clone(), args.min_shard);
-            let duration_in_ms = start.elapsed().as_millis();
-            info!(
-                "Simulation {:?} of amount {} sat completed after {} ms.",
-                combi, amount, duration_in_ms
-            );
-            sim_results.lock().unwrap().push(sim_result);
-        });
-        let combi_sim_results = if let Ok(s) = sim_results.lock() {
-            s.clone()
-        } else {
-            vec![]
-        };
-        results.push(Output::to_results_type(&combi_sim_results, combi, seed));
-    }
+    let results: Vec<Results> = WEIGHT_PARTS
+        .iter()
+        .map(|combi| {
+            let combi = *combi;
+            let combi_sim_results: Vec<SimResult> = AMOUNTS
+                .par_iter()
+                .map(|amount| {
+                    let start = Instant::now();
+                    let msat = simlib::to_millisatoshi(*amount);
+                    let sim = init_sim(seed, graph.clone(), msat, combi, &adversary_selection);
+                    info!(
+                        "Starting {:?} simulation of {} pairs of {} sats.",
+                        combi, number_of_sim_pairs, amount,
+                    );
+                    let sim_result = simulate(sim, pairs.clone(), args.min_shard);
+                    let duration_in_ms = start.elapsed().as_millis();
+                    info!(
+                        "Simulation {:?} of amount {} sat completed after {} ms.",
+                        combi, amount, duration_in_ms
+                    );
+                    sim_result
+                })
+                .collect();
+            Output::to_results_type(&combi_sim_results, combi, seed)
+        })
+        .collect();
     report_to_file(&results, output_dir, seed).expect("Writing to report failed.");
 }
 
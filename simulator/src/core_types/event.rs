@@ -27,17 +27,7 @@ impl EventQueue {
     /// Schedules a new event at a specific simtime.
     pub(crate) fn schedule(&mut self, delay: Time, event: PaymentEvent) {
         let time = self.now() + delay;
-        let result = self.events.get_mut(&time);
-        match result {
-            Some(event_list) => {
-                event_list.push_back(event);
-            }
-            None => {
-                let mut event_list = VecDeque::new();
-                event_list.push_back(event);
-                self.events.insert(time, event_list);
-            }
-        }
+        self.events.entry(time).or_default().push_back(event);
     }
 
     /// Returns the next event and removes it from the event queue
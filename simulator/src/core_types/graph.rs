@@ -6,7 +6,10 @@ use log::{debug, info, warn};
 use pathfinding::directed::strongly_connected_components::strongly_connected_components;
 use rand::{seq::SliceRandom, Rng};
 use serde::Deserialize;
-use std::{cmp, collections::HashMap};
+use std::{
+    cmp,
+    collections::{HashMap, HashSet},
+};
 
 #[derive(Clone, Deserialize, Debug)]
 pub struct Graph {
@@ -21,12 +24,11 @@ impl Graph {
         net_graph: &network_parser::Graph,
         graph_source: network_parser::GraphSource,
     ) -> Graph {
-        let nodes: Vec<Node> = net_graph.nodes.clone().into_iter().collect();
+        let nodes: Vec<Node> = net_graph.nodes.iter().cloned().collect();
         let edges: HashMap<ID, Vec<Edge>> = net_graph
-            .clone()
             .edges
-            .into_iter()
-            .map(|(id, edge)| (id, Vec::from_iter(edge)))
+            .iter()
+            .map(|(id, edges)| (id.clone(), edges.iter().cloned().collect()))
             .collect();
         let graph = Graph { nodes, edges };
         let greatest_scc = graph.reduce_to_greatest_scc();
@@ -35,7 +37,7 @@ impl Graph {
         greatest_scc
     }
 
-    fn reduce_to_greatest_scc(&self) -> Graph {
+    fn reduce_to_greatest_scc(self) -> Graph {
         info!(
             "Reducing graph with {} nodes and {} edges to greatest SCC.",
             self.node_count(),
@@ -51,16 +53,35 @@ impl Graph {
                 greatest_scc_idx = idx;
             }
         }
+        // a single SCC spans every node and edge destination
+        if sccs.len() == 1 {
+            info!(
+                "Graph is already strongly connected. Reduced to graph with {} nodes and {} edges.",
+                self.node_count(),
+                self.edge_count()
+            );
+            return self;
+        }
+        // an empty graph has no SCCs and is reduced to an empty graph
+        let greatest_scc: HashSet<&ID> = sccs.get(greatest_scc_idx).into_iter().flatten().collect();
         let greatest_scc_nodes: Vec<Node> = self
             .nodes
-            .clone()
-            .into_iter()
-            .filter(|n| sccs[greatest_scc_idx].contains(&n.id))
-            .clone()
+            .iter()
+            .filter(|n| greatest_scc.contains(&n.id))
+            .cloned()
             .collect();
+        // only keep the edges between nodes of the SCC
         let greatest_scc_edges: HashMap<ID, Vec<Edge>> = greatest_scc_nodes
             .iter()
-            .map(|n| (n.id.clone(), self.edges.get(&n.id).unwrap().clone()))
+            .map(|n| {
+                let edges = self
+                    .borrow_outedges(&n.id)
+                    .iter()
+                    .filter(|e| greatest_scc.contains(&e.destination))
+                    .cloned()
+                    .collect();
+                (n.id.clone(), edges)
+            })
             .collect();
 
         let g = Graph {
@@ -79,7 +100,7 @@ impl Graph {
         self.nodes.len()
     }
     pub fn edge_count(&self) -> usize {
-        self.edges.clone().into_values().map(|v| v.len()).sum()
+        self.edges.values().map(Vec::len).sum()
     }
 
     pub fn get_node_ids(&self) -> Vec<ID> {
@@ -142,15 +163,15 @@ impl Graph {
     }
 
     pub(crate) fn get_outedges(&self, node_id: &ID) -> Vec<Edge> {
-        if let Some(out_edges) = self.edges.get(node_id) {
-            if out_edges.is_empty() {
-                Vec::default()
-            } else {
-                out_edges.clone()
-            }
-        } else {
-            Vec::default()
-        }
+        self.borrow_outedges(node_id).to_vec()
+    }
+
+    /// Same as get_outedges but without copying the edges for callers that only read them
+    pub(crate) fn borrow_outedges(&self, node_id: &ID) -> &[Edge] {
+        self.edges
+            .get(node_id)
+            .map(Vec::as_slice)
+            .unwrap_or_default()
     }
 
     pub(crate) fn update_channel_balance(&mut self, channel_id: &ID, balance: usize) {
@@ -164,7 +185,7 @@ impl Graph {
     }
 
     pub(crate) fn get_channel_balance(&self, src_node: &ID, channel_id: &ID) -> usize {
-        self.get_outedges(src_node)
+        self.borrow_outedges(src_node)
             .iter()
             .find(|out| out.channel_id == *channel_id)
             .map(|e| e.balance)
@@ -184,7 +205,7 @@ impl Graph {
     }
 
     pub(crate) fn get_max_node_balance(&self, node: &ID) -> usize {
-        let out_edges = self.get_outedges(node);
+        let out_edges = self.borrow_outedges(node);
         let max_balance = out_edges.iter().map(|e| e.balance).max();
         if max_balance.is_none() {
             warn!("Node {} not found. Returning 0 as balance.", node);
@@ -193,22 +214,18 @@ impl Graph {
     }
 
     pub(crate) fn get_total_node_balance(&self, node: &ID) -> usize {
-        self.get_outedges(node).iter().map(|e| e.balance).sum()
+        self.borrow_outedges(node).iter().map(|e| e.balance).sum()
     }
 
     // Get all edges going to 'node' then check how much of the channel capacity is already with
     // 'node'.
     pub(crate) fn get_max_receive_amount(&self, node: &ID) -> usize {
-        let mut max_receive = 0;
-        for n in self.get_node_ids() {
-            if n != *node {
-                let edges_to_node = self.get_all_src_dest_edges(&n, node);
-                for e in edges_to_node {
-                    max_receive += e.capacity - e.balance;
-                }
-            }
-        }
-        max_receive
+        self.nodes
+            .iter()
+            .filter(|n| n.id != *node)
+            .flat_map(|n| self.get_all_src_dest_edges(&n.id, node))
+            .map(|e| e.capacity - e.balance)
+            .sum()
     }
 
     /// We calculate balances based on the edges' max_sat values using a random uniform
@@ -255,24 +272,29 @@ impl Graph {
 
     fn remove_unidrectional_edges(&self) -> Self {
         info!("Deleting unidirectional edges from graph.");
-        let mut graph_copy = self.clone();
+        let directed_edges: HashSet<(&ID, &ID)> = self
+            .edges
+            .iter()
+            .flat_map(|(src, edges)| edges.iter().map(move |out| (src, &out.destination)))
+            .collect();
         let mut num_removed = 0;
-        for (src, edges) in self.edges.iter() {
-            let from = src;
-            for out in edges.iter() {
-                let to = &out.destination;
-                // check if to->from exists
-                let edges_from_to: Vec<ID> = if let Some(edges) = self.get_edges_for_node(to) {
-                    edges.iter().map(|edge| edge.destination.clone()).collect()
-                } else {
-                    Vec::default()
-                };
-                if !edges_from_to.contains(from) {
-                    graph_copy.remove_edge(from, to);
-                    num_removed += 1;
-                }
-            }
-        }
+        let edges = self
+            .edges
+            .iter()
+            .map(|(from, edges)| {
+                let bidirectional_edges: Vec<Edge> = edges
+                    .iter()
+                    .filter(|out| directed_edges.contains(&(&out.destination, from)))
+                    .cloned()
+                    .collect();
+                num_removed += edges.len() - bidirectional_edges.len();
+                (from.clone(), bidirectional_edges)
+            })
+            .collect();
+        let graph_copy = Graph {
+            nodes: self.nodes.clone(),
+            edges,
+        };
         debug!("Removed {} unidirectional edges.", num_removed);
         info!(
             "Proceeding with {} nodes and {} edges.",
@@ -284,20 +306,20 @@ impl Graph {
 
     /// Use get_all_src_dest_edges to get all such edges
     pub(crate) fn get_edge(&self, from: &ID, to: &ID) -> Option<Edge> {
-        let out_edges = self.get_outedges(from);
+        let out_edges = self.borrow_outedges(from);
         // Assumes there is at most one edge from dest to src
-        out_edges
-            .iter()
-            .find(|out| out.destination == to.clone())
-            .cloned()
+        out_edges.iter().find(|out| out.destination == *to).cloned()
     }
 
     /// Returns all edges between two nodes. Empty if there are none
-    pub(crate) fn get_all_src_dest_edges(&self, from: &ID, to: &ID) -> Vec<Edge> {
-        self.get_outedges(from)
-            .into_iter()
-            .filter(|edge| edge.destination == to.clone())
-            .collect()
+    pub(crate) fn get_all_src_dest_edges<'a>(
+        &'a self,
+        from: &ID,
+        to: &'a ID,
+    ) -> impl Iterator<Item = &'a Edge> {
+        self.borrow_outedges(from)
+            .iter()
+            .filter(move |edge| edge.destination == *to)
     }
 
     pub(crate) fn get_random_pairs_of_nodes(
@@ -314,9 +336,9 @@ impl Graph {
         node_ids.sort();
 
         let mut pairs: Vec<(ID, ID)> = Vec::with_capacity(num_nodes);
+        // RNG initialised with seed
+        let mut rng = crate::RNG.lock().unwrap();
         for _ in 0u64..num_nodes as u64 {
-            // RNG initialised with seed
-            let mut rng = crate::RNG.lock().unwrap();
             if let Some(src_dest) = node_ids
                 .choose_multiple(&mut *rng, 2)
                 .cloned()
@@ -328,21 +350,37 @@ impl Graph {
         pairs.into_iter()
     }
 
+    #[allow(unused)]
     pub(crate) fn node_is_in_graph(&self, node: &ID) -> bool {
-        self.get_node_ids().contains(node)
+        self.nodes.iter().any(|n| n.id == *node)
     }
 
     fn get_sccs(&self) -> Vec<Vec<ID>> {
-        let successors = |node: &ID| -> Vec<ID> {
-            if let Some(succs) = self.edges.get(&node.to_owned()) {
-                let nbrs: Vec<ID> = succs.iter().map(|e| e.destination.clone()).collect();
-                nbrs
-            } else {
-                Vec::default()
+        let mut ids: Vec<&ID> = self.nodes.iter().map(|n| &n.id).collect();
+        let mut index: HashMap<&ID, usize> =
+            ids.iter().enumerate().map(|(idx, id)| (*id, idx)).collect();
+        let mut successors: Vec<Vec<usize>> = Vec::with_capacity(ids.len());
+        // edges may lead to nodes that aren't in the node list; these are appended as they come up
+        let mut idx = 0;
+        while idx < ids.len() {
+            let node = ids[idx];
+            let mut nbrs = vec![];
+            for edge in self.borrow_outedges(node) {
+                let nbr = *index.entry(&edge.destination).or_insert_with(|| {
+                    ids.push(&edge.destination);
+                    ids.len() - 1
+                });
+                nbrs.push(nbr);
             }
-        };
-        let nodes: Vec<ID> = self.nodes.iter().map(|n| n.id.clone()).collect();
-        let sccs = strongly_connected_components(&nodes, successors);
+            successors.push(nbrs);
+            idx += 1;
+        }
+        let nodes: Vec<usize> = (0..self.nodes.len()).collect();
+        let sccs: Vec<Vec<ID>> =
+            strongly_connected_components(&nodes, |idx: &usize| successors[*idx].iter().copied())
+                .into_iter()
+                .map(|scc| scc.into_iter().map(|idx| ids[idx].clone()).collect())
+                .collect();
         debug!("Got {} SCCs", sccs.len());
         sccs
     }
@@ -509,6 +547,45 @@ mod tests {
         assert_eq!(actual.edge_count(), 2);
     }
 
+    #[test]
+    fn empty_graph_has_empty_greatest_scc() {
+        let graph = Graph {
+            nodes: vec![],
+            edges: HashMap::new(),
+        };
+        let actual = graph.reduce_to_greatest_scc();
+        assert_eq!(actual.node_count(), 0);
+        assert_eq!(actual.edge_count(), 0);
+    }
+
+    #[test]
+    fn strongly_connected_graph_is_kept() {
+        let nodes: Vec<Node> = ["alice", "bob"]
+            .iter()
+            .map(|id| Node {
+                id: id.to_string(),
+                ..Default::default()
+            })
+            .collect();
+        let edge = |src: &str, dest: &str| Edge {
+            channel_id: format!("{}-{}", src, dest),
+            source: src.to_string(),
+            destination: dest.to_string(),
+            ..Default::default()
+        };
+        let edges = HashMap::from([
+            ("alice".to_string(), vec![edge("alice", "bob")]),
+            ("bob".to_string(), vec![edge("bob", "alice")]),
+        ]);
+        let graph = Graph {
+            nodes: nodes.clone(),
+            edges: edges.clone(),
+        };
+        let actual = graph.reduce_to_greatest_scc();
+        assert_eq!(actual.nodes, nodes);
+        assert_eq!(actual.edges, edges);
+    }
+
     #[test]
     fn fetch_node_ids() {
         let json_str = json_str();
@@ -667,8 +744,8 @@ mod tests {
             let from = node;
             let to = nodes[idx + 1 % nodes.len() - 1].clone();
             if *from != to {
-                let actual = graph.get_all_src_dest_edges(&from, &to);
-                assert_eq!(actual.len(), 1);
+                let actual = graph.get_all_src_dest_edges(&from, &to).count();
+                assert_eq!(actual, 1);
             }
         }
     }
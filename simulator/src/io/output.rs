@@ -5,6 +5,7 @@ use log::{error, info};
 use std::{
     error::Error,
     fs::{self, File},
+    io::{BufWriter, Write},
     path::PathBuf,
 };
 
@@ -46,7 +47,9 @@ impl Output {
         let mut file_output_path = output_path;
         file_output_path.push(format!("{}{}", run_as_string, ".json"));
         let file = File::create(file_output_path.clone()).expect("Error creating file.");
-        serde_json::to_writer_pretty(file, self).expect("Error writing to JSON file.");
+        let mut writer = BufWriter::new(file);
+        serde_json::to_writer_pretty(&mut writer, self).expect("Error writing to JSON file.");
+        writer.flush()?;
         info!(
             "Simulation output written to {}.",
             file_output_path.display()
@@ -61,17 +64,12 @@ impl Output {
 
 impl Report {
     pub fn sim_result_to_report(sim_result: &SimResult) -> Self {
-        let mut payments: Vec<PaymentInfo> = sim_result
+        let payments: Vec<PaymentInfo> = sim_result
             .successful_payments
             .iter()
+            .chain(sim_result.failed_payments.iter())
             .map(PaymentInfo::from_payment)
             .collect();
-        payments.extend(
-            sim_result
-                .failed_payments
-                .iter()
-                .map(PaymentInfo::from_payment),
-        );
         Self {
             amount: crate::to_sat(sim_result.amount),
             total_num: sim_result.total_num,
@@ -17,32 +17,30 @@ impl Simulation {
         &mut self,
         payment: &mut Payment,
     ) -> (bool, Vec<(ID, String, usize)>) {
-        let graph = self.graph.clone();
         let mut succeeded = false;
         let mut failed = false;
         let mut to_revert = Vec::new();
         // fail immediately if sender's balance on each of their edges < amount
         // Checked for single-path payments earlier already but the check is necessary here for
         // MPP.
-        let max_out_balance = graph.get_max_node_balance(&payment.source);
+        let max_out_balance = self.graph.get_max_node_balance(&payment.source);
         if max_out_balance < payment.amount_msat {
             error!("Payment shard failing. Sender {} does not have sufficient balance. Amount {}, max balance {}",  payment.source, payment.amount_msat, max_out_balance);
             failed = true;
         }
-        let graph_copy = self.graph.clone();
         if !failed {
             let mut path_finder = PathFinder::new(
                 payment.source.clone(),
                 payment.dest.clone(),
                 payment.amount_msat,
-                &graph_copy,
+                &self.graph,
                 self.routing_metric,
                 self.payment_parts,
             );
             path_finder
                 .graph
                 .set_edges(PathFinder::remove_inadequate_edges(
-                    &graph_copy,
+                    &self.graph,
                     payment.amount_msat,
                 ));
             while !succeeded && !failed {
@@ -120,7 +120,47 @@ impl Simulation {
             self.routing_metric,
             self.payment_parts
         );
-        let mut now = Time::from_secs(0.0); // start simulation at (0)
+        // start simulation at (0)
+        let now = self.schedule_payments(payment_pairs, Time::from_secs(0.0), min_shard_amt);
+        info!("Starting simulation.");
+        self.process_events();
+        assert_eq!(
+            self.num_successful + self.num_failed,
+            self.total_num_payments,
+            "Something went wrong. Expected a different number simulation events."
+        );
+        info!(
+            "Completed simulation after {} simulation secs.",
+            now.as_secs(),
+        );
+        info!(
+            "# Total payments = {}, # successful {}, # failed = {}.",
+            self.total_num_payments, self.num_successful, self.num_failed
+        );
+        self.eval_adversaries(run_all_adversary_scenarios);
+        self.eval_path_similarity();
+        SimResult {
+            run: self.run,
+            amount: self.amount,
+            total_num: self.total_num_payments,
+            num_succesful: self.num_successful,
+            num_failed: self.num_failed,
+            successful_payments: self.successful_payments.clone(),
+            failed_payments: self.failed_payments.clone(),
+            adversaries: self.adversaries.to_owned(),
+            path_distances: self.path_distances.to_owned(),
+            path_diversity: self.path_diversity.to_owned(),
+        }
+    }
+
+    /// Issues an invoice for and schedules each payment, starting at `now` and spaced by
+    /// SIM_DELAY_IN_SECS. Returns the time after the last scheduled payment.
+    pub(crate) fn schedule_payments(
+        &mut self,
+        payment_pairs: impl Iterator<Item = (ID, ID)>,
+        mut now: Time,
+        min_shard_amt: Option<usize>,
+    ) -> Time {
         for (src, dest) in payment_pairs {
             let payment_id = self.next_payment_id();
             let invoice = Invoice::new(payment_id, self.amount, &src, &dest);
@@ -135,9 +175,12 @@ impl Simulation {
             "Queued {} events for simulation.",
             self.event_queue.queue_length()
         );
+        now
+    }
 
-        info!("Starting simulation.");
-        // this is where the actual simulation happens
+    /// This is where the actual simulation happens: dispatches queued payments until the event
+    /// queue is empty and records the results
+    pub(crate) fn process_events(&mut self) {
         while let Some(event) = self.event_queue.next() {
             match event {
                 PaymentEvent::Scheduled { mut payment } => {
@@ -161,33 +204,6 @@ impl Simulation {
                 }
             }
         }
-        assert_eq!(
-            self.num_successful + self.num_failed,
-            self.total_num_payments,
-            "Something went wrong. Expected a different number simulation events."
-        );
-        info!(
-            "Completed simulation after {} simulation secs.",
-            now.as_secs(),
-        );
-        info!(
-            "# Total payments = {}, # successful {}, # failed = {}.",
-            self.total_num_payments, self.num_successful, self.num_failed
-        );
-        self.eval_adversaries(run_all_adversary_scenarios);
-        self.eval_path_similarity();
-        SimResult {
-            run: self.run,
-            amount: self.amount,
-            total_num: self.total_num_payments,
-            num_succesful: self.num_successful,
-            num_failed: self.num_failed,
-            successful_payments: self.successful_payments.clone(),
-            failed_payments: self.failed_payments.clone(),
-            adversaries: self.adversaries.to_owned(),
-            path_distances: self.path_distances.to_owned(),
-            path_diversity: self.path_diversity.to_owned(),
-        }
     }
 
     pub fn draw_n_pairs_for_simulation(
@@ -209,18 +225,11 @@ impl Simulation {
     }
 
     pub(crate) fn add_invoice(&mut self, invoice: Invoice) {
-        // Has this node already issued invoices?
-        match self.outstanding_invoices.get_mut(&invoice.destination) {
-            Some(node_invoices) => {
-                node_invoices.insert(invoice.id, invoice);
-            }
-            None => {
-                let mut node_invoices = HashMap::new();
-                node_invoices.insert(invoice.id, invoice.clone());
-                self.outstanding_invoices
-                    .insert(invoice.destination, node_invoices);
-            }
-        };
+        // Creates the node's invoice map if this is its first invoice
+        self.outstanding_invoices
+            .entry(invoice.destination.clone())
+            .or_default()
+            .insert(invoice.id, invoice);
     }
 
     /// Invoices each node has issued; map of <node, <invoice id, invoice>
@@ -114,27 +114,13 @@ impl Simulation {
         let mut part_hits_successful = 0;
         let mut adv_count: HashMap<usize, usize> = HashMap::default();
         let mut adv_count_successful: HashMap<usize, usize> = HashMap::default();
-        let mut contains_an_adversary = |payment: &Payment| {
-            let mut all_paths = payment.used_paths.to_owned();
-            all_paths.extend(payment.failed_paths.to_owned());
-            for path in all_paths.iter() {
-                if !path.path.path_contains_adversary(adv).is_empty() {
-                    hits += 1;
-                    if payment.succeeded {
-                        hits_successful += 1;
-                    }
-                    break;
-                }
-            }
-        };
         for payment in payments {
-            contains_an_adversary(payment);
-            let mut used_paths = payment.used_paths.to_owned();
-            used_paths.extend(payment.failed_paths.to_owned());
+            let mut contains_an_adversary = false;
             let mut num_attacks = 0;
-            for path in used_paths.iter() {
+            for path in payment.used_paths.iter().chain(payment.failed_paths.iter()) {
                 let num_adv = path.path.path_contains_adversary(adv);
                 if !num_adv.is_empty() {
+                    contains_an_adversary = true;
                     part_hits += 1;
                     if payment.succeeded {
                         part_hits_successful += 1;
@@ -152,6 +138,12 @@ impl Simulation {
                         .or_insert(1);
                 }
             }
+            if contains_an_adversary {
+                hits += 1;
+                if payment.succeeded {
+                    hits_successful += 1;
+                }
+            }
         }
         (
             (hits, hits_successful),
@@ -231,15 +223,13 @@ impl Simulation {
         let mut correlated = 0;
         let mut correlated_successful = 0;
         for payment in payments {
-            let mut all_paths = payment.used_paths.to_owned();
-            all_paths.extend(payment.failed_paths.to_owned());
-            let mut paths_containing_adversaries = 0;
-            for path in all_paths.iter() {
-                // no need to exclude the src and dest and the called function takes that into account
-                if !path.path.path_contains_adversary(adv).is_empty() {
-                    paths_containing_adversaries += 1;
-                }
-            }
+            // no need to exclude the src and dest and the called function takes that into account
+            let paths_containing_adversaries = payment
+                .used_paths
+                .iter()
+                .chain(payment.failed_paths.iter())
+                .filter(|path| !path.path.path_contains_adversary(adv).is_empty())
+                .count();
             // because the same payment was seen more than once
             if paths_containing_adversaries >= 2 {
                 correlated += 1;
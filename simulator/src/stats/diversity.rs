@@ -6,20 +6,19 @@ use itertools::Itertools;
 
 type NodeLinkID = (ID, String);
 
+/// Constants scaling the utility of added diversity in the EPD
+static LAMBDAS: [f32; 4] = [0.2, 0.5, 0.7, 1.0];
+
 impl Simulation {
     /// Calculates the Levenshtein distances of mpp paths and the diversity as defined by Rohrer et
     /// al.
     pub(crate) fn eval_path_similarity(&mut self) {
-        let mut levenshtein_distances = vec![];
-        let mut path_diversity = vec![];
-        let lambdas = vec![0.2, 0.5, 0.7, 1.0];
-        for (i, lambda) in lambdas.into_iter().enumerate() {
-            let mut epds = vec![];
-            for payment in &self.successful_payments {
-                if payment.num_parts <= 1 {
-                    continue;
-                }
-                let paths: Vec<Vec<NodeLinkID>> = payment
+        let mpp_paths: Vec<Vec<Vec<NodeLinkID>>> = self
+            .successful_payments
+            .iter()
+            .filter(|payment| payment.num_parts > 1)
+            .map(|payment| {
+                payment
                     .used_paths
                     .iter()
                     .map(|p| {
@@ -29,18 +28,23 @@ impl Simulation {
                             .map(|h| (h.0.clone(), h.3.clone()))
                             .collect()
                     })
-                    .collect();
-                epds.push(Self::calculate_effective_path_diversity(&paths, lambda));
-                if i == 0 {
-                    // we only need to calculate this once: hacky
-                    levenshtein_distances.extend(Self::calculate_levenshtein_distance(&paths));
-                }
-            }
-            path_diversity.push(Diversity {
+                    .collect()
+            })
+            .collect();
+        let levenshtein_distances = mpp_paths
+            .iter()
+            .flat_map(|paths| Self::calculate_levenshtein_distance(paths))
+            .collect();
+        let path_diversity = LAMBDAS
+            .into_iter()
+            .map(|lambda| Diversity {
                 lambda,
-                diversity: epds,
-            });
-        }
+                diversity: mpp_paths
+                    .iter()
+                    .map(|paths| Self::calculate_effective_path_diversity(paths, lambda))
+                    .collect(),
+            })
+            .collect();
         self.path_distances.0 = levenshtein_distances;
         self.path_diversity.0 = path_diversity;
     }
@@ -48,16 +52,19 @@ impl Simulation {
     /// The EPD is an aggregation of path diversities for a selected set of paths between a given
     /// node- pair
     fn calculate_effective_path_diversity(paths: &[Vec<NodeLinkID>], lambda: f32) -> f32 {
+        let paths: Vec<HashSet<String>> = paths
+            .iter()
+            .map(|p| Self::get_intermediate_node_and_edges(p))
+            .collect();
         let mut aggregated_div = 0.0;
-        for idx in 0..paths.len() {
+        for (idx, base_path) in paths.iter().enumerate() {
             let mut div_min_path_i = f32::MAX;
-            let mut alternate_paths = paths.to_vec();
-            // the base path should be the only item returned by drain
-            if let Some(base_path) = alternate_paths.drain(idx..idx + 1).last() {
-                for path in alternate_paths {
-                    let div = Self::calculate_path_diversity(&base_path, &path);
-                    div_min_path_i = f32::min(div_min_path_i, div);
+            for (alternate_idx, path) in paths.iter().enumerate() {
+                if alternate_idx == idx {
+                    continue;
                 }
+                let div = Self::diversity_of_node_and_edges(base_path, path);
+                div_min_path_i = f32::min(div_min_path_i, div);
             }
             aggregated_div += div_min_path_i;
         }
@@ -72,32 +79,41 @@ impl Simulation {
     ) -> f32 {
         let base_path = Self::get_intermediate_node_and_edges(base_path);
         let alternate_path = Self::get_intermediate_node_and_edges(alternate_path);
-        1.0 - (base_path.intersection(&alternate_path).count() as f32 / base_path.len() as f32)
+        Self::diversity_of_node_and_edges(&base_path, &alternate_path)
+    }
+
+    /// The diversity of two paths given as their intermediate nodes and edges
+    fn diversity_of_node_and_edges(
+        base_path: &HashSet<String>,
+        alternate_path: &HashSet<String>,
+    ) -> f32 {
+        1.0 - (base_path.intersection(alternate_path).count() as f32 / base_path.len() as f32)
     }
 
     /// Returns a distance for each pair of given paths
     fn calculate_levenshtein_distance(paths: &[Vec<NodeLinkID>]) -> Vec<usize> {
         let mut distances = vec![];
-        let pairs = paths.iter().cloned().cartesian_product(paths);
-        let mut seen_pairs: Vec<Vec<ID>> = vec![];
-        for (lhs, rhs) in pairs {
-            let lhs: Vec<ID> = lhs.iter().map(|l| l.0.clone()).collect();
-            let rhs: Vec<ID> = rhs.iter().map(|l| l.0.clone()).collect();
+        let paths: Vec<Vec<ID>> = paths
+            .iter()
+            .map(|path| path.iter().map(|l| l.0.clone()).collect())
+            .collect();
+        let mut seen_pairs: HashSet<&[ID]> = HashSet::new();
+        for (lhs, rhs) in paths.iter().cartesian_product(&paths) {
             // skip same vecs as pair
             if lhs != rhs {
                 // order of pairs does not matter so we skip half the pairs
-                if seen_pairs.contains(&rhs) {
+                if seen_pairs.contains(rhs.as_slice()) {
                     continue;
                 }
-                distances.push(Self::levenshtein(lhs.clone(), rhs));
-                seen_pairs.push(lhs);
+                distances.push(Self::levenshtein(lhs, rhs));
+                seen_pairs.insert(lhs);
             }
         }
         distances
     }
 
     /// Implements the Levenshtein distance for the used paths of a payment
-    fn levenshtein(lhs: Vec<ID>, rhs: Vec<ID>) -> usize {
+    fn levenshtein(lhs: &[ID], rhs: &[ID]) -> usize {
         let mut result = 0;
         let lhs_len = lhs.len();
         let rhs_len = rhs.len();
@@ -178,18 +194,18 @@ mod tests {
 
     #[test]
     fn path_difference() {
-        let lhs = vec![];
-        let rhs = vec![];
+        let lhs: Vec<ID> = vec![];
+        let rhs: Vec<ID> = vec![];
         let lhs_len = lhs.len();
-        let actual = Simulation::levenshtein(lhs.clone(), rhs.clone());
+        let actual = Simulation::levenshtein(&lhs, &rhs);
         let expected = lhs_len;
         assert_eq!(actual, expected);
-        let actual = Simulation::levenshtein(lhs, rhs);
+        let actual = Simulation::levenshtein(&lhs, &rhs);
         let expected = 0;
         assert_eq!(actual, expected);
         let lhs = vec!["a".to_string(), "b".to_string(), "c".to_string()];
         let rhs = vec!["a".to_string(), "e".to_string(), "c".to_string()];
-        let actual = Simulation::levenshtein(lhs.clone(), rhs);
+        let actual = Simulation::levenshtein(&lhs, &rhs);
         let expected = 1;
         assert_eq!(actual, expected);
         let rhs = vec![
@@ -199,7 +215,7 @@ mod tests {
             "d".to_string(),
             "e".to_string(),
         ];
-        let actual = Simulation::levenshtein(lhs, rhs);
+        let actual = Simulation::levenshtein(&lhs, &rhs);
         let expected = 3;
         assert_eq!(actual, expected);
     }
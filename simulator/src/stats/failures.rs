@@ -1,14 +1,12 @@
-use crate::{
-    event::*, io::PaymentInfo, payment::Payment, stats::TargetedAttack, time::Time, Invoice,
-    PaymentParts, Simulation, ID,
-};
+use crate::{event::*, io::PaymentInfo, payment::Payment, stats::TargetedAttack, Simulation, ID};
 
 use itertools::EitherOrBoth::{Both, Left, Right};
 use itertools::Itertools;
 #[cfg(not(test))]
-use log::{debug, info, trace};
+use log::{info, trace};
+use std::collections::HashSet;
 #[cfg(test)]
-use std::{println as info, println as debug, println as trace};
+use std::{println as info, println as trace};
 
 impl Simulation {
     pub(crate) fn rerun_simulation(&self, targets: &[ID]) -> TargetedAttack {
@@ -41,54 +39,18 @@ impl Simulation {
             self.routing_metric,
             self.payment_parts
         );
-        let mut now = self.event_queue.now();
-        for (src, dest) in payment_pairs {
-            let payment_id = self.next_payment_id();
-            let invoice = Invoice::new(payment_id, self.amount, &src, &dest);
-            self.add_invoice(invoice);
-            let payment = Payment::new(payment_id, src, dest, self.amount, min_shard_amt);
-            let event = PaymentEvent::Scheduled { payment };
-            self.event_queue.schedule(now, event);
-            now += Time::from_secs(crate::SIM_DELAY_IN_SECS);
-        }
-        self.total_num_payments = self.event_queue.queue_length();
-        debug!(
-            "Queued {} events for simulation.",
-            self.event_queue.queue_length()
-        );
-
+        let now = self.event_queue.now();
+        self.schedule_payments(payment_pairs, now, min_shard_amt);
         info!("Starting simulation.");
-        while let Some(event) = self.event_queue.next() {
-            match event {
-                PaymentEvent::Scheduled { mut payment } => {
-                    debug!(
-                        "Dispatching scheduled payment {} at simulation time = {}.",
-                        payment.payment_id,
-                        self.event_queue.now()
-                    );
-                    match self.payment_parts {
-                        PaymentParts::Single => self.send_single_payment(&mut payment),
-                        PaymentParts::Split => self.send_mpp_payment(&mut payment),
-                    };
-                }
-                PaymentEvent::UpdateFailed { payment } => {
-                    self.num_failed += 1;
-                    self.failed_payments.push(payment.to_owned());
-                }
-                PaymentEvent::UpdateSuccesful { payment } => {
-                    self.num_successful += 1;
-                    self.successful_payments.push(payment.to_owned());
-                }
-            }
-        }
+        self.process_events();
         info!("Completed simulation of targeted attacks.");
         self.eval_path_similarity();
-        let mut payments: Vec<PaymentInfo> = self
+        let payments: Vec<PaymentInfo> = self
             .successful_payments
             .iter()
+            .chain(self.failed_payments.iter())
             .map(PaymentInfo::from_payment)
             .collect();
-        payments.extend(self.failed_payments.iter().map(PaymentInfo::from_payment));
         TargetedAttack {
             total_num: self.total_num_payments,
             num_successful: self.num_successful,
@@ -110,15 +72,14 @@ impl Simulation {
     ) -> ((impl Iterator<Item = (ID, ID)> + Clone), Option<usize>) {
         let mut payment_pairs = vec![];
         let mut min_shard_amt = None;
+        let nodes: HashSet<&ID> = self.graph.nodes.iter().map(|n| &n.id).collect();
         for payments_iter in self
             .successful_payments
             .iter()
             .zip_longest(self.failed_payments.iter())
         {
             let mut check_and_add_payment = |payment: &Payment| {
-                if self.graph.node_is_in_graph(&payment.source)
-                    && self.graph.node_is_in_graph(&payment.dest)
-                {
+                if nodes.contains(&payment.source) && nodes.contains(&payment.dest) {
                     min_shard_amt = Some(payment.min_shard_amt);
                     payment_pairs.push((payment.source.clone(), payment.dest.clone()));
                 }
@@ -17,9 +17,8 @@ impl Simulation {
     pub(crate) fn send_mpp_payment(&mut self, payment: &mut Payment) -> bool {
         let mut succeeded = false;
         let mut failed = false;
-        let graph = Box::new(self.graph.clone());
         // fail immediately if sender's total balance < amount
-        let total_out_balance = graph.get_total_node_balance(&payment.source);
+        let total_out_balance = self.graph.get_total_node_balance(&payment.source);
         if total_out_balance < payment.amount_msat {
             error!("Payment failing. {} total balance insufficient for payment. Amount {}, max balance {}", payment.source, payment.amount_msat, total_out_balance);
             payment.htlc_attempts += 1;
@@ -27,7 +26,7 @@ impl Simulation {
         }
         if !failed {
             // we would otherwise miscount failed htlc_attempts
-            let max_receive_balance = graph.get_max_receive_amount(&payment.dest);
+            let max_receive_balance = self.graph.get_max_receive_amount(&payment.dest);
             if max_receive_balance < payment.amount_msat {
                 error!("Payment failing due to insufficient receive capacity. Payment amount {}, max receive {}", payment.amount_msat, max_receive_balance);
                 payment.htlc_attempts += 1;
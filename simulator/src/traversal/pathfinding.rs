@@ -2,7 +2,7 @@ use crate::{graph::Graph, Edge, EdgeWeight, PaymentParts, RoutingMetric, ID};
 
 use log::{debug, trace};
 use serde::Serialize;
-use std::collections::{HashMap, VecDeque};
+use std::collections::{HashMap, HashSet, VecDeque};
 
 /// Describes a path between two nodes
 #[derive(Debug, Clone, PartialEq, Default, Serialize)]
@@ -89,17 +89,15 @@ impl Path {
     /// TODO: We don't use the tx data?
     pub(crate) fn path_contains_adversary(&self, adv: &[ID]) -> Vec<(ID, usize, usize)> {
         let mut adversaries = vec![];
-        let involved_nodes = self.get_involved_nodes()[1..self.hops.len()].to_owned(); //excludes src
-        for i in 0..involved_nodes.len() - 1 {
-            // exclude dest
-            let node = involved_nodes[i].to_string();
-            if adv.contains(&node) {
-                let offset = self.hops.len() - involved_nodes.len();
-                let hops = self.hops.clone();
-                let amt_rcvd: usize = (i..involved_nodes.len()).map(|h| hops[h + offset].1).sum();
-                let ttl_left: usize = (i..involved_nodes.len()).map(|h| hops[h + offset].2).sum();
-                let tx_data = (node.to_owned(), amt_rcvd, ttl_left);
-                adversaries.push(tx_data);
+        // excludes src and dest
+        for idx in 1..self.hops.len() - 1 {
+            let node = &self.hops[idx].0;
+            if adv.contains(node) {
+                let (amt_rcvd, ttl_left) = self
+                    .hops
+                    .range(idx..)
+                    .fold((0, 0), |(amt, ttl), hop| (amt + hop.1, ttl + hop.2));
+                adversaries.push((node.clone(), amt_rcvd, ttl_left));
             }
         }
         adversaries
@@ -170,17 +168,16 @@ impl Path {
     }
 
     pub(crate) fn is_first_hop(&self, node: &ID) -> bool {
-        match self.get_involved_nodes().iter().position(|n| n.eq(node)) {
+        match self.hops.iter().position(|h| h.0.eq(node)) {
             None => false,
             Some(i) => i == 1,
         }
     }
 
     pub(crate) fn is_last_hop(&self, node: &ID) -> bool {
-        let involved_nodes = self.get_involved_nodes();
-        match involved_nodes.iter().position(|n| n.eq(node)) {
+        match self.hops.iter().position(|h| h.0.eq(node)) {
             None => false,
-            Some(i) => i == involved_nodes.len() - 2,
+            Some(i) => i == self.hops.len() - 2,
         }
     }
 
@@ -321,6 +318,8 @@ impl PathFinder {
                 };
                 if include_src {
                     // src charges a fee
+                    let edge_fee =
+                        Self::get_edge_fee(&cheapest_edge, accumulated_amount).into_inner();
                     match self.routing_metric {
                         RoutingMetric::MaxProb => {
                             accumulated_weight *= 1.0
@@ -330,14 +329,9 @@ impl PathFinder {
                                 )
                                 .into_inner()
                         }
-                        RoutingMetric::MinFee => {
-                            accumulated_weight +=
-                                Self::get_edge_fee(&cheapest_edge, accumulated_amount).into_inner()
-                        }
+                        RoutingMetric::MinFee => accumulated_weight += edge_fee,
                     };
-                    let edge_fee = Self::get_edge_fee(&cheapest_edge, accumulated_amount)
-                        .into_inner() as usize;
-                    accumulated_amount += edge_fee;
+                    accumulated_amount += edge_fee as usize;
                     let edge_timelock = cheapest_edge.cltv_expiry_delta;
                     accumulated_time += edge_timelock;
                 }
@@ -367,19 +361,16 @@ impl PathFinder {
                     None => panic!("Edge in path does not exist! {src} -> {dest}"),
                     Some(e) => e,
                 };
+                let edge_fee = Self::get_edge_fee(&cheapest_edge, accumulated_amount).into_inner();
                 match self.routing_metric {
                     RoutingMetric::MaxProb => {
                         accumulated_weight *= 1.0
                             - Self::get_edge_failure_probabilty(&cheapest_edge, accumulated_amount)
                                 .into_inner()
                     }
-                    RoutingMetric::MinFee => {
-                        accumulated_weight +=
-                            Self::get_edge_fee(&cheapest_edge, accumulated_amount).into_inner()
-                    }
+                    RoutingMetric::MinFee => accumulated_weight += edge_fee,
                 };
-                let edge_fee =
-                    Self::get_edge_fee(&cheapest_edge, accumulated_amount).into_inner() as usize;
+                let edge_fee = edge_fee as usize;
                 accumulated_amount += edge_fee;
                 let edge_timelock = cheapest_edge.cltv_expiry_delta;
                 accumulated_time += edge_timelock;
@@ -422,25 +413,22 @@ impl PathFinder {
     }
 
     fn get_successors(&self, node: &ID) -> Vec<(ID, EdgeWeight)> {
-        let succs = match self.graph.get_edges_for_node(node) {
-            Some(edges) => edges
-                .iter()
-                .map(|e| {
-                    (
-                        e.destination.clone(),
-                        if e.source != self.src {
-                            Self::get_edge_weight(e, self.amount, self.routing_metric)
-                        } else if self.routing_metric == RoutingMetric::MinFee {
-                            ordered_float::OrderedFloat(0.0)
-                        } else {
-                            ordered_float::OrderedFloat(1.0)
-                        },
-                    )
-                })
-                .collect(),
-            None => Vec::default(),
-        };
-        succs
+        self.graph
+            .borrow_outedges(node)
+            .iter()
+            .map(|e| {
+                (
+                    e.destination.clone(),
+                    if e.source != self.src {
+                        Self::get_edge_weight(e, self.amount, self.routing_metric)
+                    } else if self.routing_metric == RoutingMetric::MinFee {
+                        ordered_float::OrderedFloat(0.0)
+                    } else {
+                        ordered_float::OrderedFloat(1.0)
+                    },
+                )
+            })
+            .collect()
     }
 
     /// Returns the "cheapest" edge between src and dist bearing the routing me in mind
@@ -451,32 +439,43 @@ impl PathFinder {
         let from_to_outedges = self.graph.get_all_src_dest_edges(from, to);
         let mut cheapest_edge = None;
         let mut min_weight = ordered_float::OrderedFloat(f32::MAX);
-        for edge in from_to_outedges.into_iter() {
-            let edge_weight = Self::get_edge_weight(&edge, self.amount, self.routing_metric);
+        for edge in from_to_outedges {
+            let edge_weight = Self::get_edge_weight(edge, self.amount, self.routing_metric);
             if edge_weight < min_weight {
                 min_weight = edge_weight;
                 cheapest_edge = Some(edge);
             }
         }
-        cheapest_edge
+        cheapest_edge.cloned()
     }
 
     /// Remove edges that do not meet the minimum criteria (cap < amount) from the graph
     pub fn remove_inadequate_edges(graph: &Graph, amount: usize) -> HashMap<String, Vec<Edge>> {
         debug!("Removing edges with insufficient funds.");
-        let mut copy = graph.clone();
+        // like remove_edge, an underfunded edge drops every edge between its nodes, both ways
+        let mut underfunded: HashSet<(&ID, &ID)> = HashSet::new();
         let mut ctr = 0;
-        for edge in graph.edges.iter() {
-            // iter each node's edges
-            for e in edge.1 {
-                if e.balance < amount {
-                    ctr += 1;
-                    copy.remove_edge(&e.source, &e.destination);
-                }
+        for e in graph.edges.values().flatten() {
+            if e.balance < amount {
+                ctr += 1;
+                underfunded.insert((&e.source, &e.destination));
+                underfunded.insert((&e.destination, &e.source));
             }
         }
+        let edges = graph
+            .edges
+            .iter()
+            .map(|(src, edges)| {
+                let adequate_edges = edges
+                    .iter()
+                    .filter(|e| !underfunded.contains(&(src, &e.destination)))
+                    .cloned()
+                    .collect();
+                (src.clone(), adequate_edges)
+            })
+            .collect();
         trace!("Removed {} edges with insufficient funds.", ctr);
-        copy.edges
+        edges
     }
 }
 
@@ -936,4 +935,56 @@ mod tests {
         assert!(path.is_last_hop(&"chan".to_string()));
         assert!(!path.is_last_hop(&"dina".to_string()));
     }
+
+    #[test]
+    fn underfunded_edges_are_removed_in_both_directions() {
+        let edge = |channel_id: &str, src: &str, dest: &str, balance: usize| Edge {
+            channel_id: channel_id.to_string(),
+            source: src.to_string(),
+            destination: dest.to_string(),
+            balance,
+            ..Default::default()
+        };
+        let nodes = ["alice", "bob", "chan"]
+            .iter()
+            .map(|id| crate::Node {
+                id: id.to_string(),
+                ..Default::default()
+            })
+            .collect();
+        let edges = HashMap::from([
+            (
+                "alice".to_string(),
+                vec![
+                    edge("alice-bob1", "alice", "bob", 10),
+                    edge("alice-bob2", "alice", "bob", 1000),
+                    edge("alice-chan", "alice", "chan", 1000),
+                ],
+            ),
+            (
+                "bob".to_string(),
+                vec![
+                    edge("bob-alice1", "bob", "alice", 1000),
+                    edge("bob-alice2", "bob", "alice", 1000),
+                    edge("bob-chan", "bob", "chan", 1000),
+                ],
+            ),
+            (
+                "chan".to_string(),
+                vec![
+                    edge("chan-alice", "chan", "alice", 1000),
+                    edge("chan-bob", "chan", "bob", 5),
+                ],
+            ),
+        ]);
+        let graph = Graph { nodes, edges };
+        let actual = PathFinder::remove_inadequate_edges(&graph, 100);
+        let channel_ids = |node: &str| -> Vec<String> {
+            actual[node].iter().map(|e| e.channel_id.clone()).collect()
+        };
+        assert_eq!(actual.len(), 3);
+        assert_eq!(channel_ids("alice"), vec!["alice-chan".to_string()]);
+        assert!(channel_ids("bob").is_empty());
+        assert_eq!(channel_ids("chan"), vec!["chan-alice".to_string()]);
+    }
 }